@@ -3,17 +3,9 @@ QuantumScope - AI-Powered Research Platform
 A powerful CLI tool for AI-powered research and report generation.
 """
 
-from .main import (
-    __version__,
-    __author__,
-    __email__,
-    __license__,
-    APP_NAME,
-    QuantumScopeConfig,
-    QuantumScopeEngine,
-    QuantumScopeCLI,
-    main 
-)
+import importlib
+import sys
+import types
 
 __all__ = [
     "__version__",
@@ -25,4 +17,29 @@ __all__ = [
     "QuantumScopeEngine",
     "QuantumScopeCLI",
     "main",
-]
\ No newline at end of file
+]
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Loading QuantumScope.main binds the submodule as "main" on the package; export the
+        # entry-point function under that name instead, whichever import happens first
+        if name == "main" and isinstance(value, types.ModuleType):
+            value = value.main
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
+
+def __getattr__(name):
+    # Import .main (and websockets, ssl, asyncio with it) only when one of its names is first used
+    if name in __all__:
+        module = importlib.import_module(".main", __name__)
+        globals().update({attr: getattr(module, attr) for attr in __all__})
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
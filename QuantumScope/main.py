@@ -19,10 +19,16 @@ import threading
 import argparse
 import os
 import ssl
+import stat
 from urllib.parse import quote
 from typing import Dict, List, Optional, Any
 import certifi
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, stdlib json is the fallback
+    orjson = None
+
 __version__ = "1.0.2"
 __author__ = "Parvesh Rawal from XenArcAI"
 __email__ = "team@xenarcai.com"
@@ -84,6 +90,19 @@ TONES = {
     "5": "Informative - Clear and comprehensive information",
 }
 
+# Lookups derived once from the tables above instead of re-splitting the strings on every use
+REPORT_TYPE_VALUES = [info["api_value"] for info in REPORT_TYPES.values()]
+TONE_NAMES = {key: desc.split(" - ")[0] for key, desc in TONES.items()}
+TONE_BY_NAME = {name.lower(): name for name in TONE_NAMES.values()}
+
+# Server signals that the research stream is finished
+COMPLETION_TYPES = frozenset({"end_of_stream", "complete", "finished", "done", "end"})
+# Never matches: these upper-case markers are tested against response.lower() in
+# _is_research_complete. Kept as-is on purpose to preserve existing completion behaviour.
+COMPLETION_MARKERS = ("<|END_OF_STREAM|>", "TASK_COMPLETE")
+
+NOT_JSON = object()  # Returned for frames that don't decode, so a JSON null stays distinguishable
+
 DEFAULT_CONFIG = {
     "report_type": "1",
     "tone": "1",
@@ -95,26 +114,79 @@ DEFAULT_CONFIG = {
     "max_retries": 6
 }
 
+def atomic_write(path: str, data: bytes):
+    """Write data in one call; regular files are swapped into place through a temp file beside them"""
+    path = os.path.realpath(path)  # Write through symlinks rather than replacing them
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        mode = None  # New file: let the kernel apply the umask when the temp file is created
+    else:
+        if not stat.S_ISREG(mode):
+            # Devices, pipes and the like can't be swapped; write to them directly
+            with open(path, 'wb') as f:
+                f.write(data)
+            return
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{os.urandom(6).hex()}.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0), 0o666)
+    except OSError:
+        # Directory not writable, but the file itself may be
+        with open(path, 'wb') as f:
+            f.write(data)
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp_path, stat.S_IMODE(mode))  # Keep the replaced file's permissions
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+_ssl_context = None
+
+def get_ssl_context() -> ssl.SSLContext:
+    """SSL context with certifi certificates, built once and shared by every connection"""
+    global _ssl_context
+    if _ssl_context is None:
+        context = ssl.create_default_context()
+        context.load_verify_locations(certifi.where())
+        _ssl_context = context
+    return _ssl_context
+
 class QuantumScopeConfig:
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path or os.path.expanduser("~/.QuantumScope/config.json")
         self.config = DEFAULT_CONFIG.copy()
+        self._config_dir_ready = False  # Set once the config directory is known to exist
         self.load_config()
 
     def load_config(self):
         try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    user_config = json.load(f)
-                    self.config.update(user_config)
+            with open(self.config_path, 'r') as f:
+                user_config = json.load(f)
+            self._config_dir_ready = True
+            self.config.update(user_config)
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"{C.YELLOW}Warning: Could not load config file: {e}{C.RESET}")
 
     def save_config(self):
         try:
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-            with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            if not self._config_dir_ready:
+                config_dir = os.path.dirname(self.config_path)
+                if config_dir:
+                    os.makedirs(config_dir, exist_ok=True)
+                self._config_dir_ready = True
+            # Translate newlines as the text-mode open() this replaced did (CRLF on Windows)
+            content = json.dumps(self.config, indent=2).replace('\n', os.linesep)
+            atomic_write(self.config_path, content.encode('utf-8'))
         except Exception as e:
             print(f"{C.YELLOW}Warning: Could not save config: {e}{C.RESET}")
 
@@ -158,6 +230,8 @@ class ProgressIndicator:
         self.thread = None
 
     def start(self):
+        if not sys.stdout.isatty():
+            return  # Nobody sees the redraws when output is piped or redirected
         self.thread = threading.Thread(target=self._animate)
         self.thread.daemon = True
         self.stop_event.clear()
@@ -205,7 +279,7 @@ class QuantumScopeEngine:
         sources = []
         download_links = {}
         message_count = 0
-        start_time = time.time()
+        start_time = time.monotonic()
 
         progress = None
         if not show_logs:
@@ -219,13 +293,9 @@ class QuantumScopeEngine:
         self.interrupt_handler.interrupted = False
 
         try:
-            # Create SSL context with certifi certificates
-            ssl_context = ssl.create_default_context()
-            ssl_context.load_verify_locations(certifi.where())
-            
             async with websockets.connect(uri, 
                                         additional_headers=headers,
-                                        ssl=ssl_context,
+                                        ssl=get_ssl_context(),
                                         ping_interval=20, 
                                         ping_timeout=20,
                                         open_timeout=10) as websocket:
@@ -258,9 +328,12 @@ class QuantumScopeEngine:
                         message_count += 1
                         timeout_count = 0 
 
-                        await self._process_response(response, show_logs, sources, download_links, final_report_parts)
+                        # Decode once; both consumers below share the parsed message
+                        data = self._decode_response(response)
+
+                        await self._process_response(response, data, show_logs, sources, download_links, final_report_parts)
 
-                        if self._is_research_complete(response):
+                        if self._is_research_complete(response, data):
                             research_complete = True
 
                     except asyncio.TimeoutError:
@@ -276,7 +349,7 @@ class QuantumScopeEngine:
 
 
                 final_report_str = "".join(final_report_parts)
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
 
                 if progress:
                     progress.stop()
@@ -295,7 +368,7 @@ class QuantumScopeEngine:
             print(f"{ERROR_COLOR}❌ Server error (Status {e.status_code}). The server might be busy or unable to connect. Please try again later.{C.RESET}")
         except websockets.exceptions.ConnectionClosedOK:
             final_report_str = "".join(final_report_parts) 
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             if progress: progress.stop()
             print(f"\n{SUCCESS_COLOR}✅ Research completed and connection closed cleanly.{C.RESET}")
             return await self._finalize_results(final_report_str, sources, download_links, message_count, duration, base_url)
@@ -306,7 +379,7 @@ class QuantumScopeEngine:
         except KeyboardInterrupt:
             if progress: progress.stop()
             final_report_str = "".join(final_report_parts)
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             print(f"\n{C.YELLOW}🛑 Research interrupted by user.{C.RESET}")
             return await self._finalize_results(final_report_str, sources, download_links,
                                               message_count, duration, base_url, interrupted=True)
@@ -323,10 +396,23 @@ class QuantumScopeEngine:
         return None
 
 
-    async def _process_response(self, response: str, show_logs: bool, sources: List,
-                              download_links: Dict, final_report_parts: List[str]):
+    @staticmethod
+    def _decode_response(response: str) -> Any:
+        """Parse a websocket message, returning NOT_JSON when it is not JSON"""
+        if orjson is not None:
+            try:
+                return orjson.loads(response)
+            except orjson.JSONDecodeError:
+                # Only invalid JSON and NaN/Infinity land here; orjson decodes >64-bit ints as floats
+                pass
         try:
-            data = json.loads(response)
+            return json.loads(response)
+        except json.JSONDecodeError:
+            return NOT_JSON
+
+    async def _process_response(self, response: str, data: Any, show_logs: bool, sources: List,
+                              download_links: Dict, final_report_parts: List[str]):
+        if data is not NOT_JSON:
             msg_type = data.get("type")
 
             if msg_type == "logs":
@@ -343,7 +429,7 @@ class QuantumScopeEngine:
                 print(f"{ERROR_COLOR}❌ Server-side error: {error_message}{C.RESET}")
 
 
-        except json.JSONDecodeError:
+        else:
             if "pong" in response.lower() or "ping" in response.lower():
                 if show_logs and self.config.get("debug_mode"): print(f"{LOG_COLOR}Received: {response}{C.RESET}")
             elif show_logs : 
@@ -391,17 +477,16 @@ class QuantumScopeEngine:
                 if show_logs:
                     print(f"  {SUCCESS_COLOR}🔗 {file_type.upper()}: {URL_COLOR}{full_url}{C.RESET}")
 
-    def _is_research_complete(self, response: str) -> bool:
-        try:
-            data = json.loads(response)
-            if data.get("type") in ["end_of_stream", "complete", "finished", "done", "end"]:
+    def _is_research_complete(self, response: str, data: Any) -> bool:
+        if data is not NOT_JSON:
+            if data.get("type") in COMPLETION_TYPES:
                 return True
             if data.get("status") == "completed":
                 return True
             if data.get("type") == "logs" and data.get("content") == "report_written":
                 return True
-        except json.JSONDecodeError:
-            if any(marker in response.lower() for marker in ["<|END_OF_STREAM|>", "TASK_COMPLETE"]): 
+        else:
+            if any(marker in response.lower() for marker in COMPLETION_MARKERS):
                  return True
         return False
 
@@ -490,7 +575,7 @@ For more help, visit {self.config.get("base_url", "")}
         parser.add_argument("-v", "--version", action="version", version=f"%(prog)s {__version__}")
 
         research_group = parser.add_argument_group('Research Options')
-        type_choices = [info['api_value'] for info in REPORT_TYPES.values()] 
+        type_choices = REPORT_TYPE_VALUES
         type_help_list = "\n".join([f"    {v['api_value']}: {v['display']}" for k,v in REPORT_TYPES.items()])
         research_group.add_argument(
             "-t", "--type",
@@ -499,12 +584,12 @@ For more help, visit {self.config.get("base_url", "")}
             help=f"Report type. Choices:\n{type_help_list}\n(default: %(default)s)"
         )
 
-        tone_choices = [t.split(" - ")[0].lower() for t in TONES.values()]
-        tone_help_list = "\n".join([f"    {t.split(' - ')[0].lower()}: {t}" for k,t in TONES.items()])
+        tone_choices = list(TONE_BY_NAME)
+        tone_help_list = "\n".join([f"    {TONE_NAMES[k].lower()}: {t}" for k,t in TONES.items()])
         research_group.add_argument(
             "-o", "--tone",
             choices=tone_choices,
-            default=TONES[self.config.get("tone", "1")].split(" - ")[0].lower(),
+            default=TONE_NAMES[self.config.get("tone", "1")].lower(),
             help=f"Report tone. Choices:\n{tone_help_list}\n(default: %(default)s)"
         )
         research_group.add_argument("-d", "--domains", nargs="+", metavar="DOMAIN", help="Filter search by specific domains (e.g., arxiv.org nature.com)")
@@ -541,12 +626,7 @@ For more help, visit {self.config.get("base_url", "")}
             elif args.query:
                 query_str = " ".join(args.query)
                 
-                selected_tone_api_value = args.tone.capitalize()
-                api_tone = "Objective"
-                for t_key, t_val in TONES.items():
-                    if args.tone == t_val.split(" - ")[0].lower():
-                        api_tone = t_val.split(" - ")[0]
-                        break
+                api_tone = TONE_BY_NAME.get(args.tone, "Objective")
 
                 await self._single_search(query_str, args, report_type_api=args.type, tone_api=api_tone)
             else:
@@ -582,7 +662,7 @@ For more help, visit {self.config.get("base_url", "")}
         print(f"{C.YELLOW}Type your query, or 'config', 'help', 'set [option] [value]', 'quit'.{C.RESET}")
 
         current_report_type_api = REPORT_TYPES[self.config.get("report_type", "1")]["api_value"]
-        current_tone_api = TONES[self.config.get("tone", "1")].split(" - ")[0]
+        current_tone_api = TONE_NAMES[self.config.get("tone", "1")]
         current_domains = self.config.get("domains", [])
         current_show_logs = self.config.get("show_logs", True)
 
@@ -605,7 +685,7 @@ For more help, visit {self.config.get("base_url", "")}
                 elif command == "config":
                     await self._configure()
                     current_report_type_api = REPORT_TYPES[self.config.get("report_type", "1")]["api_value"]
-                    current_tone_api = TONES[self.config.get("tone", "1")].split(" - ")[0]
+                    current_tone_api = TONE_NAMES[self.config.get("tone", "1")]
                     current_domains = self.config.get("domains", [])
 
                 elif command == "set":
@@ -614,25 +694,18 @@ For more help, visit {self.config.get("base_url", "")}
                         continue
                     option, value = command_parts[1], command_parts[2]
                     if option == "type":
-                        valid_types_api = [info['api_value'] for info in REPORT_TYPES.values()]
-                        if value in valid_types_api:
+                        if value in REPORT_TYPE_VALUES:
                             current_report_type_api = value
                             print(f"{SUCCESS_COLOR}Report type set to: {value}{C.RESET}")
                         else:
-                            print(f"{ERROR_COLOR}Invalid type. Valid: {', '.join(valid_types_api)}{C.RESET}")
+                            print(f"{ERROR_COLOR}Invalid type. Valid: {', '.join(REPORT_TYPE_VALUES)}{C.RESET}")
                     elif option == "tone":
-                        valid_tones_api = [t.split(" - ")[0] for t in TONES.values()]
-                        cli_value_lower = value.lower()
-                        found_tone = None
-                        for t_api in valid_tones_api:
-                            if t_api.lower() == cli_value_lower:
-                                found_tone = t_api
-                                break
+                        found_tone = TONE_BY_NAME.get(value.lower())
                         if found_tone:
                             current_tone_api = found_tone
                             print(f"{SUCCESS_COLOR}Tone set to: {found_tone}{C.RESET}")
                         else:
-                            print(f"{ERROR_COLOR}Invalid tone. Valid: {', '.join(t.lower() for t in valid_tones_api)}{C.RESET}")
+                            print(f"{ERROR_COLOR}Invalid tone. Valid: {', '.join(TONE_BY_NAME)}{C.RESET}")
                     elif option == "domains":
                         current_domains = [d.strip() for d in value.split(',')]
                         print(f"{SUCCESS_COLOR}Domains set to: {', '.join(current_domains) if current_domains else 'Any'}{C.RESET}")
@@ -725,9 +798,9 @@ For more help, visit {self.config.get("base_url", "")}
 {C.BOLD}Commands:{C.RESET}
   <your query>          - Perform a research task with current settings.
   set type <type>       - Set report type for this session (e.g., set type summary).
-                          Valid types: {', '.join(info['api_value'] for info in REPORT_TYPES.values())}.
+                          Valid types: {', '.join(REPORT_TYPE_VALUES)}.
   set tone <tone>       - Set report tone for this session (e.g., set tone formal).
-                          Valid tones: {', '.join(t.split(" - ")[0].lower() for t in TONES.values())}.
+                          Valid tones: {', '.join(TONE_BY_NAME)}.
   set domains <d1,d2>   - Set domains for this session (e.g., set domains arxiv.org,nature.com). Leave empty to clear.
   set logs <on|off>     - Toggle real-time logs for this session.
   config                - Configure and save default settings for future sessions.
@@ -754,15 +827,16 @@ For more help, visit {self.config.get("base_url", "")}
             else:
                 content_to_save = result.get("report", "")
                 if not content_to_save and result.get("download_links"):
-                    content_to_save += "No direct text report generated in stream.\n\nDownload links:\n"
-                    for ft, link in result["download_links"].items():
-                        content_to_save += f"- {ft.upper()}: {link}\n"
+                    content_to_save = "No direct text report generated in stream.\n\nDownload links:\n" + "".join(
+                        f"- {ft.upper()}: {link}\n" for ft, link in result["download_links"].items())
                 if not content_to_save:
                     content_to_save = "No report content or download links found in the result."
 
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content_to_save)
+            # Keep the blocking file write off the event loop
+            loop = asyncio.get_running_loop()
+            data = content_to_save.replace('\n', os.linesep).encode('utf-8')  # Text-mode newlines
+            await loop.run_in_executor(None, atomic_write, filename, data)
 
             print(f"{SUCCESS_COLOR}✅ Report saved to: {os.path.abspath(filename)}{C.RESET}")
         except Exception as e:
@@ -775,42 +849,40 @@ For more help, visit {self.config.get("base_url", "")}
         report_type = result.get("report_type", "N/A") 
         tone = result.get("tone", "N/A")
 
-        md = f"# QuantumScope Research Report\n\n"
-        md += f"**Query:** `{query}` (Placeholder - actual query not in result dict yet)\n"
-        md += f"**Report Type:** {report_type}\n"
-        md += f"**Tone:** {tone}\n"
-        md += f"**Generated:** {time.strftime('%Y-%m-%d %H:%M:%S %Z')}\n"
-        md += f"**Duration:** {result.get('duration', 0):.2f} seconds\n"
-        md += f"**Messages Processed:** {result.get('message_count', 0)}\n\n"
+        md = [
+            "# QuantumScope Research Report\n\n",
+            f"**Query:** `{query}` (Placeholder - actual query not in result dict yet)\n",
+            f"**Report Type:** {report_type}\n",
+            f"**Tone:** {tone}\n",
+            f"**Generated:** {time.strftime('%Y-%m-%d %H:%M:%S %Z')}\n",
+            f"**Duration:** {result.get('duration', 0):.2f} seconds\n",
+            f"**Messages Processed:** {result.get('message_count', 0)}\n\n",
+        ]
 
         if result.get('interrupted'):
-            md += "⚠️ **Note:** This report generation was interrupted and may be incomplete.\n\n"
+            md.append("⚠️ **Note:** This report generation was interrupted and may be incomplete.\n\n")
 
         if result.get('sources'):
-            md += "## 📚 Sources\n\n"
-            for i, source_url in enumerate(result['sources'], 1):
-                md += f"{i}. <{source_url}>\n" 
-            md += "\n"
+            md.append("## 📚 Sources\n\n")
+            md.extend(f"{i}. <{source_url}>\n" for i, source_url in enumerate(result['sources'], 1))
+            md.append("\n")
 
         if result.get('download_links'):
-            md += "## 🔗 Download Links\n\n"
-            for file_type, link in result['download_links'].items():
-                md += f"- **{file_type.upper()}:** <{link}>\n"
-            md += "\n"
+            md.append("## 🔗 Download Links\n\n")
+            md.extend(f"- **{file_type.upper()}:** <{link}>\n" for file_type, link in result['download_links'].items())
+            md.append("\n")
 
-        md += "## 📄 Report Text\n\n"
+        md.append("## 📄 Report Text\n\n")
         report_text = result.get('report', '').strip()
         if report_text:
-            md += "```text\n"
-            md += report_text
-            md += "\n```\n"
+            md.extend(("```text\n", report_text, "\n```\n"))
         elif result.get('download_links'):
-            md += "No direct text report was generated in the stream. Please use the download links above.\n"
+            md.append("No direct text report was generated in the stream. Please use the download links above.\n")
         else:
-            md += "No report text or download links were generated.\n"
+            md.append("No report text or download links were generated.\n")
 
-        md += f"\n---\n*Generated by {APP_NAME} v{__version__}*"
-        return md
+        md.append(f"\n---\n*Generated by {APP_NAME} v{__version__}*")
+        return "".join(md)
 
 def main():
     """Main entry point for the QuantumScope"""
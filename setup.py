@@ -37,6 +37,9 @@ setup(
             "mypy>=0.910",
             "pre-commit>=2.15.0",
         ],
+        "speed": [
+            "orjson>=3.8",
+        ],
         "docs": [
             "sphinx>=4.0",
             "sphinx-rtd-theme>=1.0",